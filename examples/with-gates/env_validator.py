@@ -3,4 +3,5 @@ import os
 
 def validate_env(required: list[str]) -> list[str]:
     """Return names of missing environment variables."""
-    return [var for var in required if var not in os.environ]
+    env = os.environ
+    return [var for var in dict.fromkeys(required) if var not in env]
@@ -1,13 +1,18 @@
-from urllib.request import urlopen
+import urllib3
+
+_POOL = urllib3.PoolManager(retries=False, timeout=5)
 
 
 def check_health(urls: list[str]) -> dict[str, str]:
     """Check if URLs are reachable. Returns {url: 'up'/'down'}."""
     results = {}
-    for url in urls:
+    for url in dict.fromkeys(urls):
         try:
-            urlopen(url, timeout=5)
-            results[url] = "up"
+            response = _POOL.request("HEAD", url)
+            if response.status == 405:
+                response = _POOL.request("GET", url, preload_content=False)
+                response.close()
+            results[url] = "up" if response.status < 400 else "down"
         except Exception:
             results[url] = "down"
     return results
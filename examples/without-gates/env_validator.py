@@ -4,7 +4,7 @@ from dataclasses import dataclass
 from typing import Any, Callable, Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class ValidationResult:
     """Result of environment validation."""
     valid: bool
@@ -46,23 +46,29 @@ class EnvValidator:
 
     def validate(self) -> ValidationResult:
         """Validate all environment variables."""
+        if not self.required:
+            return ValidationResult(valid=True, missing=[], present=[], errors=[])
+
         missing = []
         present = []
         errors = []
+        env = os.environ
+        defaults = self.defaults
+        validators = self.type_validators
 
         for var in self.required:
-            value = os.environ.get(var)
+            value = env.get(var)
             if value is None:
-                if var in self.defaults:
-                    os.environ[var] = str(self.defaults[var])
+                if var in defaults:
+                    env[var] = str(defaults[var])
                     present.append(var)
                 else:
                     missing.append(var)
             else:
                 present.append(var)
-                if var in self.type_validators:
+                if var in validators:
                     try:
-                        self.type_validators[var](value)
+                        validators[var](value)
                     except Exception as e:
                         errors.append(f"{var}: {e}")
 
@@ -1,16 +1,40 @@
-"""HTTP health checker with concurrent checks, response timing, and CLI support."""
+"""HTTP health checker with concurrent checks, response timing, and CLI support.
+
+Probes send Cache-Control: no-cache and Pragma: no-cache so intermediate
+proxies and CDNs cannot answer from a stale copy; a cached 200 would hide
+an origin that is down.
+
+When one host accounts for several of the URLs, its probes share a single
+multiplexed HTTP/2 connection if httpx is installed with HTTP/2 support
+(pip install "httpx[http2]"); everything else goes through aiohttp.
+"""
 import argparse
+import asyncio
+import atexit
 import json
+import logging
+import os
+import socket
 import sys
+import threading
 import time
-import urllib.request
-import urllib.error
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from dataclasses import dataclass, field
+from collections import Counter
+from dataclasses import dataclass, replace
 from typing import Optional
 
+import aiohttp
+import yarl
+from aiohttp.abc import AbstractResolver
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+logger = logging.getLogger(__name__)
+
 
-@dataclass
+@dataclass(slots=True)
 class HealthResult:
     """Result of a health check for a single URL."""
     url: str
@@ -33,39 +57,262 @@ class HealthResult:
         return result
 
 
-def check_single_url(url: str, timeout: int = 10, headers: Optional[dict] = None) -> HealthResult:
-    """Check health of a single URL."""
-    headers = headers or {}
-    headers.setdefault("User-Agent", "HealthChecker/1.0")
+# Cache, sessions and probes all live on one background event loop, so
+# repeated check_health calls keep their sockets and DNS cache warm.
+_CACHE: dict[tuple, tuple[float, float, HealthResult]] = {}  # key -> (checked_at, expires_at, result)
+_SESSIONS: dict[int, aiohttp.ClientSession] = {}
+_SLOTS: dict[int, asyncio.Semaphore] = {}
+_RESOLVER: Optional["_CachingResolver"] = None
+_HTTP2_CLIENTS: dict[int, Optional["httpx.AsyncClient"]] = {}
+_HTTP2_MIN_GROUP = 5
+_LOOP: Optional[asyncio.AbstractEventLoop] = None
+_LOOP_THREAD: Optional[threading.Thread] = None
+_LOOP_PID: Optional[int] = None
+_LOOP_LOCK = threading.Lock()
+# Objects bound to a loop abandoned after fork(). They are kept alive, never
+# closed: their finalizers would unregister sockets from the epoll instance
+# the child shares with its parent.
+_ABANDONED: list = []
+
+
+class _CachingResolver(AbstractResolver):
+    """Threaded resolver whose lookups are shared by every session for ttl seconds."""
+
+    def __init__(self, ttl: float = 300.0):
+        self._resolver = aiohttp.ThreadedResolver()
+        self._ttl = ttl
+        self._lookups: dict[tuple[str, int, int], tuple[float, asyncio.Future]] = {}
+
+    def prefetch(self, host: str, port: int, family: int = socket.AF_UNSPEC) -> asyncio.Future:
+        """Start a lookup, or reuse a fresh or in-flight one, without waiting for it."""
+        key = (host, port, family)
+        now = time.monotonic()
+        hit = self._lookups.get(key)
+        if hit and now - hit[0] < self._ttl:
+            return hit[1]
+        lookup = asyncio.ensure_future(self._resolver.resolve(host, port, family))
+        lookup.add_done_callback(lambda done: self._forget_failure(key, done))
+        self._lookups[key] = (now, lookup)
+        return lookup
+
+    def prune(self) -> None:
+        """Drop lookups older than the TTL. Called once per sweep."""
+        now = time.monotonic()
+        for key in [key for key, (started, _) in self._lookups.items() if now - started >= self._ttl]:
+            del self._lookups[key]
+
+    def _forget_failure(self, key: tuple[str, int, int], lookup: asyncio.Future) -> None:
+        """Drop failed lookups so the next sweep retries them."""
+        if lookup.cancelled() or lookup.exception() is not None:
+            if self._lookups.get(key, (0, None))[1] is lookup:
+                del self._lookups[key]
+
+    async def resolve(self, host: str, port: int = 0, family: int = socket.AF_INET) -> list:
+        return list(await asyncio.shield(self.prefetch(host, port, family)))
+
+    async def close(self) -> None:
+        await self._resolver.close()
+
+
+def _host_port(url: str) -> Optional[tuple[str, int]]:
+    """Return the (host, port) a URL connects to, or None if it has none."""
+    try:
+        parsed = yarl.URL(url)
+    except ValueError:
+        return None
+    if not parsed.raw_host or not parsed.port:
+        return None
+    return parsed.raw_host, parsed.port
+
+
+def _get_loop() -> asyncio.AbstractEventLoop:
+    """Return the shared event loop, (re)starting its thread when it is not running.
+
+    A forked child inherits _LOOP but not the thread driving it, so the loop
+    is rebuilt whenever the pid changed or the thread has died. After a
+    fork, sessions and clients bound to the old loop are abandoned rather
+    than closed; if only the thread died they are closed on the old loop.
+    """
+    global _LOOP, _LOOP_THREAD, _LOOP_PID, _RESOLVER
+    with _LOOP_LOCK:
+        if _LOOP is None or _LOOP_PID != os.getpid() or not _LOOP_THREAD.is_alive():
+            if _LOOP is None:
+                atexit.register(_shutdown)
+            elif _LOOP_PID != os.getpid():
+                _ABANDONED.append((_LOOP, dict(_SESSIONS), dict(_HTTP2_CLIENTS), _RESOLVER))
+            else:
+                _LOOP.run_until_complete(_close_sessions())
+                _LOOP.close()
+            _SESSIONS.clear()
+            _SLOTS.clear()
+            _HTTP2_CLIENTS.clear()
+            _RESOLVER = None
+            _LOOP = asyncio.new_event_loop()
+            _LOOP_PID = os.getpid()
+            _LOOP_THREAD = threading.Thread(target=_LOOP.run_forever, name="health", daemon=True)
+            _LOOP_THREAD.start()
+        return _LOOP
+
+
+def _get_resolver() -> _CachingResolver:
+    """Return the DNS cache shared by all sessions. Call on the shared loop."""
+    global _RESOLVER
+    if _RESOLVER is None:
+        _RESOLVER = _CachingResolver()
+    return _RESOLVER
+
+
+def _get_session(max_workers: int) -> aiohttp.ClientSession:
+    """Return the keep-alive session for a concurrency limit. Call on the shared loop."""
+    session = _SESSIONS.get(max_workers)
+    if session is None:
+        connector = aiohttp.TCPConnector(
+            limit=max_workers,
+            resolver=_get_resolver(),
+            use_dns_cache=False
+        )
+        session = _SESSIONS[max_workers] = aiohttp.ClientSession(connector=connector)
+    return session
+
+
+def _get_slots(max_workers: int) -> asyncio.Semaphore:
+    """Return the semaphore capping in-flight probes for a concurrency limit. Call on the shared loop."""
+    if max_workers not in _SLOTS:
+        _SLOTS[max_workers] = asyncio.Semaphore(max_workers)
+    return _SLOTS[max_workers]
+
+
+def _get_http2_client(max_workers: int) -> Optional["httpx.AsyncClient"]:
+    """Return the HTTP/2 client for a concurrency limit, or None without httpx[http2]."""
+    if max_workers not in _HTTP2_CLIENTS:
+        client = None
+        if httpx is not None:
+            try:
+                client = httpx.AsyncClient(
+                    http2=True,
+                    limits=httpx.Limits(
+                        max_connections=max_workers,
+                        max_keepalive_connections=max_workers
+                    )
+                )
+            except ImportError:
+                pass  # h2 missing
+        _HTTP2_CLIENTS[max_workers] = client
+    return _HTTP2_CLIENTS[max_workers]
+
+
+async def _close_sessions() -> None:
+    """Close every cached session and the shared resolver."""
+    for session in _SESSIONS.values():
+        await session.close()
+    _SESSIONS.clear()
+    for client in _HTTP2_CLIENTS.values():
+        if client is not None:
+            await client.aclose()
+    _HTTP2_CLIENTS.clear()
+    if _RESOLVER is not None:
+        await _RESOLVER.close()
+
+
+def _shutdown() -> None:
+    """Close sessions and stop the shared loop at interpreter exit."""
+    if _LOOP_PID != os.getpid() or not _LOOP_THREAD.is_alive():
+        return
+    asyncio.run_coroutine_threadsafe(_close_sessions(), _LOOP).result(timeout=5)
+    _LOOP.call_soon_threadsafe(_LOOP.stop)
+
+
+def _run(coro):
+    """Run a coroutine on the shared loop and wait for its result."""
+    return asyncio.run_coroutine_threadsafe(coro, _get_loop()).result()
 
-    request = urllib.request.Request(url, headers=headers)
+
+async def _probe(
+    session: aiohttp.ClientSession,
+    url: str,
+    timeout: aiohttp.ClientTimeout,
+    headers: dict
+) -> tuple[int, str]:
+    """Send HEAD, falling back to GET when the server rejects it. Never reads the body."""
+    options = {
+        "headers": headers,
+        "allow_redirects": False,
+        "timeout": timeout
+    }
+    async with session.head(url, **options) as response:
+        if response.status != 405:
+            return response.status, response.reason
+    async with session.get(url, **options) as response:
+        return response.status, response.reason
+
+
+async def _probe_http2(
+    client: "httpx.AsyncClient",
+    url: str,
+    timeout: aiohttp.ClientTimeout,
+    headers: dict
+) -> tuple[int, str]:
+    """Same as _probe, over the multiplexed httpx client."""
+    request_timeout = httpx.Timeout(timeout.sock_read, connect=timeout.sock_connect, pool=None)
+    try:
+        response = await client.head(url, headers=headers, timeout=request_timeout)
+        if response.status_code != 405:
+            return response.status_code, response.reason_phrase
+        async with client.stream("GET", url, headers=headers, timeout=request_timeout) as response:
+            return response.status_code, response.reason_phrase
+    except httpx.TimeoutException as e:
+        raise asyncio.TimeoutError from e
+
+
+async def _check(
+    probe,
+    client,
+    slots: asyncio.Semaphore,
+    url: str,
+    timeout: aiohttp.ClientTimeout,
+    headers: dict
+) -> HealthResult:
+    """Check health of a single URL with the given probe and shared client."""
+    async with slots:
+        # Time starts once a slot is free, so queueing behind max_workers
+        # is not counted as response time.
+        return await _timed_check(probe, client, url, timeout, headers)
+
+
+async def _timed_check(
+    probe,
+    client,
+    url: str,
+    timeout: aiohttp.ClientTimeout,
+    headers: dict
+) -> HealthResult:
+    """Probe a URL and time it."""
     start_time = time.time()
 
     try:
-        with urllib.request.urlopen(request, timeout=timeout) as response:
-            elapsed_ms = (time.time() - start_time) * 1000
+        status_code, reason = await probe(client, url, timeout, headers)
+        elapsed_ms = (time.time() - start_time) * 1000
+        if status_code >= 400:
             return HealthResult(
                 url=url,
-                status="up",
-                status_code=response.status,
-                response_time_ms=elapsed_ms
+                status="down",
+                status_code=status_code,
+                response_time_ms=elapsed_ms,
+                error=reason
             )
-    except urllib.error.HTTPError as e:
-        elapsed_ms = (time.time() - start_time) * 1000
         return HealthResult(
             url=url,
-            status="down",
-            status_code=e.code,
-            response_time_ms=elapsed_ms,
-            error=str(e.reason)
+            status="up",
+            status_code=status_code,
+            response_time_ms=elapsed_ms
         )
-    except urllib.error.URLError as e:
+    except asyncio.TimeoutError:
         elapsed_ms = (time.time() - start_time) * 1000
         return HealthResult(
             url=url,
             status="down",
             response_time_ms=elapsed_ms,
-            error=str(e.reason)
+            error="timed out"
         )
     except Exception as e:
         elapsed_ms = (time.time() - start_time) * 1000
@@ -77,38 +324,142 @@ def check_single_url(url: str, timeout: int = 10, headers: Optional[dict] = None
         )
 
 
+def _client_timeout(timeout: float, connect_timeout: float) -> aiohttp.ClientTimeout:
+    """Budget connect and read separately so unreachable hosts fail fast."""
+    return aiohttp.ClientTimeout(
+        total=None,
+        sock_connect=min(connect_timeout, timeout),
+        sock_read=timeout
+    )
+
+
+async def _check_all(
+    urls: list[str],
+    timeout: aiohttp.ClientTimeout,
+    max_workers: int,
+    headers: Optional[dict],
+    cache_ttl: float,
+    deadline: Optional[float] = None
+) -> list[HealthResult]:
+    """Check each distinct URL once, returning one result per input URL in input order."""
+    headers = {
+        "User-Agent": "HealthChecker/1.0",
+        "Cache-Control": "no-cache",
+        "Pragma": "no-cache",
+        **(headers or {})
+    }
+    # Headers and timeouts change what a probe returns (e.g. 401 without
+    # credentials), so they are part of the cache key.
+    probe_key = (frozenset(headers.items()), timeout.sock_connect, timeout.sock_read)
+
+    unique_urls = list(dict.fromkeys(urls))
+    now = time.monotonic()
+    cached = {}
+    for url in unique_urls:
+        hit = _CACHE.get((url, probe_key))
+        if hit and min(hit[1], hit[0] + cache_ttl) > now:
+            cached[url] = hit[2]
+
+    pending = [url for url in unique_urls if url not in cached]
+    if pending:
+        session = _get_session(max_workers)
+        slots = _get_slots(max_workers)
+        http2_client = _get_http2_client(max_workers)
+        crowded = set()
+        if http2_client is not None:
+            per_host = Counter(_host_port(url) for url in pending if url.startswith("https://"))
+            crowded = {key for key, count in per_host.items() if key and count >= _HTTP2_MIN_GROUP}
+
+        # Resolve every host up front; otherwise lookups queue behind the
+        # connection limit and each one costs a slot a resolver round trip.
+        resolver = _get_resolver()
+        resolver.prune()
+        for host_port in {_host_port(url) for url in pending} - {None} - crowded:
+            resolver.prefetch(*host_port)
+        tasks = [
+            asyncio.ensure_future(
+                _check(_probe_http2, http2_client, slots, url, timeout, headers)
+                if url.startswith("https://") and _host_port(url) in crowded
+                else _check(_probe, session, slots, url, timeout, headers)
+            )
+            for url in pending
+        ]
+        _, unfinished = await asyncio.wait(tasks, timeout=deadline)
+        if unfinished:
+            logger.warning(
+                "Health check deadline of %ss exceeded; %d of %d URLs unchecked",
+                deadline, len(unfinished), len(tasks)
+            )
+            for task in unfinished:
+                task.cancel()
+            await asyncio.gather(*unfinished, return_exceptions=True)
+
+        checked_at = time.monotonic()
+        for key in [key for key, entry in _CACHE.items() if entry[1] <= checked_at]:
+            del _CACHE[key]
+        for url, task in zip(pending, tasks):
+            if task in unfinished:
+                cached[url] = HealthResult(url=url, status="down", error="deadline exceeded")
+                continue
+            error = task.exception()
+            cached[url] = (
+                task.result() if error is None
+                else HealthResult(url=url, status="down", error=str(error))
+            )
+            if cache_ttl > 0:
+                _CACHE[(url, probe_key)] = (checked_at, checked_at + cache_ttl, cached[url])
+
+    # Copies, so callers mutating a result cannot change the cached entry.
+    return [replace(cached[url]) for url in urls]
+
+
+def check_single_url(
+    url: str,
+    timeout: int = 10,
+    headers: Optional[dict] = None,
+    cache_ttl: float = 30.0,
+    connect_timeout: float = 2.0
+) -> HealthResult:
+    """Check health of a single URL, reusing a result younger than cache_ttl seconds."""
+    client_timeout = _client_timeout(timeout, connect_timeout)
+    return _run(_check_all([url], client_timeout, 1, headers, cache_ttl))[0]
+
+
 def check_health(
     urls: list[str],
     timeout: int = 10,
     max_workers: int = 5,
-    headers: Optional[dict] = None
+    headers: Optional[dict] = None,
+    cache_ttl: float = 30.0,
+    deadline: Optional[float] = None,
+    connect_timeout: float = 2.0
 ) -> dict:
     """
     Check health of multiple URLs concurrently.
 
+    Results younger than cache_ttl seconds are reused instead of re-probing
+    the URL; pass cache_ttl=0 to always hit the network. When deadline is
+    set, URLs still unanswered after that many seconds are reported down
+    with error "deadline exceeded" instead of holding up the whole batch.
+    Connecting is capped at connect_timeout seconds and each read at
+    timeout seconds.
+
     Returns dict with 'results', 'summary', and 'all_healthy' keys.
     """
-    results = []
-
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        future_to_url = {
-            executor.submit(check_single_url, url, timeout, headers): url
-            for url in urls
-        }
-
-        for future in as_completed(future_to_url):
-            result = future.result()
-            results.append(result)
-
-    # Sort by original order
-    url_order = {url: i for i, url in enumerate(urls)}
-    results.sort(key=lambda r: url_order.get(r.url, 999))
+    client_timeout = _client_timeout(timeout, connect_timeout)
+    results = _run(
+        _check_all(urls, client_timeout, max_workers, headers, cache_ttl, deadline)
+    )
 
-    up_count = sum(1 for r in results if r.status == "up")
-    down_count = sum(1 for r in results if r.status == "down")
+    up_count = 0
+    result_dicts = []
+    for r in results:
+        result_dicts.append(r.to_dict())
+        up_count += r.status == "up"
+    down_count = len(results) - up_count
 
     return {
-        "results": [r.to_dict() for r in results],
+        "results": result_dicts,
         "summary": {
             "total": len(results),
             "up": up_count,
@@ -125,7 +476,8 @@ def parse_args():
     parser.add_argument("urls", nargs="*", help="URLs to check")
     parser.add_argument("-f", "--file", help="File containing URLs (one per line)")
     parser.add_argument("-t", "--timeout", type=int, default=10, help="Timeout in seconds")
-    parser.add_argument("-w", "--workers", type=int, default=5, help="Max concurrent workers")
+    parser.add_argument("-c", "--connect-timeout", type=float, default=2.0, help="Connect timeout in seconds")
+    parser.add_argument("-w", "--workers", type=int, default=5, help="Max concurrent connections")
     parser.add_argument("-j", "--json", action="store_true", help="Output as JSON")
     return parser.parse_args()
 
@@ -143,7 +495,12 @@ def main():
         print("No URLs provided", file=sys.stderr)
         sys.exit(1)
 
-    results = check_health(urls, timeout=args.timeout, max_workers=args.workers)
+    results = check_health(
+        urls,
+        timeout=args.timeout,
+        max_workers=args.workers,
+        connect_timeout=args.connect_timeout
+    )
 
     if args.json:
         print(json.dumps(results, indent=2))
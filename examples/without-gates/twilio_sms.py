@@ -2,16 +2,20 @@
 import argparse
 import base64
 import json
-import re
 import sys
-import urllib.error
 import urllib.parse
-import urllib.request
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 from typing import Optional
 
+import urllib3
 
-@dataclass
+try:
+    import re2 as re
+except ImportError:
+    import re
+
+
+@dataclass(slots=True)
 class SMSResult:
     """Result of an SMS send operation."""
     success: bool
@@ -46,22 +50,31 @@ class TwilioSMSService:
     """Service for sending SMS via Twilio API."""
 
     MAX_BODY_LENGTH = 1600
-    PHONE_PATTERN = re.compile(r"^\+[1-9]\d{1,14}$")
+    PHONE_PATTERN = re.compile(r"^\+[1-9][0-9]{1,14}$")
     API_BASE = "https://api.twilio.com/2010-04-01"
+    _POOL = urllib3.PoolManager(maxsize=8, retries=False)
 
     def __init__(
         self,
         account_sid: str,
         auth_token: str,
         default_from: Optional[str] = None,
-        timeout: int = 30
+        timeout: int = 30,
+        connect_timeout: float = 5.0
     ):
         """Initialize the Twilio SMS service."""
         self.account_sid = account_sid
         self.auth_token = auth_token
         self.default_from = default_from
+        self._encoded_from = urllib.parse.quote_plus(default_from) if default_from else None
         self.timeout = timeout
+        self._timeout = urllib3.Timeout(connect=min(connect_timeout, timeout), read=timeout)
         self._auth_header = self._create_auth_header()
+        self._url = f"{self.API_BASE}/Accounts/{account_sid}/Messages.json"
+        self._headers = {
+            "Authorization": self._auth_header,
+            "Content-Type": "application/x-www-form-urlencoded"
+        }
 
     def _create_auth_header(self) -> str:
         """Create the Basic Auth header."""
@@ -71,7 +84,9 @@ class TwilioSMSService:
 
     def _validate_phone_number(self, number: str) -> bool:
         """Validate phone number format (E.164)."""
-        return bool(self.PHONE_PATTERN.match(number))
+        if not (3 <= len(number) <= 16 and number[0] == "+" and number[1] != "0"):
+            return False
+        return bool(self.PHONE_PATTERN.fullmatch(number))
 
     def _validate_body(self, body: str) -> tuple[bool, Optional[str]]:
         """Validate message body."""
@@ -85,7 +100,8 @@ class TwilioSMSService:
         self,
         to: str,
         body: str,
-        from_number: Optional[str] = None
+        from_number: Optional[str] = None,
+        parse_response: bool = True
     ) -> SMSResult:
         """
         Send an SMS message.
@@ -94,6 +110,9 @@ class TwilioSMSService:
             to: Destination phone number (E.164 format)
             body: Message content
             from_number: Sender phone number (defaults to service default)
+            parse_response: Decode Twilio's reply for message_sid and status;
+                when False a successful reply is drained (so the connection
+                can be reused) but not decoded
 
         Returns:
             SMSResult with success status and details
@@ -124,21 +143,49 @@ class TwilioSMSService:
             return SMSResult(success=False, error_message=body_error)
 
         # Build request
-        url = f"{self.API_BASE}/Accounts/{self.account_sid}/Messages.json"
-        data = urllib.parse.urlencode({
-            "To": to,
-            "From": from_number,
-            "Body": body
-        }).encode()
-
-        request = urllib.request.Request(url, data=data, method="POST")
-        request.add_header("Authorization", self._auth_header)
-        request.add_header("Content-Type", "application/x-www-form-urlencoded")
+        if from_number == self.default_from:
+            quote = urllib.parse.quote_plus
+            data = f"To={quote(to)}&From={self._encoded_from}&Body={quote(body)}".encode()
+        else:
+            data = urllib.parse.urlencode({
+                "To": to,
+                "From": from_number,
+                "Body": body
+            }).encode()
 
         # Send request
         try:
-            with urllib.request.urlopen(request, timeout=self.timeout) as response:
-                response_data = json.loads(response.read().decode())
+            response = self._POOL.urlopen(
+                "POST",
+                self._url,
+                body=data,
+                headers=self._headers,
+                timeout=self._timeout,
+                preload_content=False
+            )
+            try:
+                if response.status >= 400:
+                    reason = response.reason
+                    error_body = response.read(4096).decode("utf-8", "replace")
+                    if not response.closed:
+                        # Oversized error body: drop the connection instead of draining it
+                        response.close()
+                    try:
+                        error_data = json.loads(error_body)
+                        return SMSResult(
+                            success=False,
+                            error_code=error_data.get("code"),
+                            error_message=error_data.get("message", reason)
+                        )
+                    except json.JSONDecodeError:
+                        return SMSResult(
+                            success=False,
+                            error_code=response.status,
+                            error_message=reason
+                        )
+                if not parse_response:
+                    return SMSResult(success=True, to=to, from_number=from_number, body=body)
+                response_data = json.load(response)
                 return SMSResult(
                     success=True,
                     message_sid=response_data.get("sid"),
@@ -147,25 +194,13 @@ class TwilioSMSService:
                     from_number=response_data.get("from"),
                     body=response_data.get("body")
                 )
-        except urllib.error.HTTPError as e:
-            error_body = e.read().decode() if e.fp else ""
-            try:
-                error_data = json.loads(error_body)
-                return SMSResult(
-                    success=False,
-                    error_code=error_data.get("code"),
-                    error_message=error_data.get("message", str(e.reason))
-                )
-            except json.JSONDecodeError:
-                return SMSResult(
-                    success=False,
-                    error_code=e.code,
-                    error_message=str(e.reason)
-                )
-        except urllib.error.URLError as e:
+            finally:
+                response.drain_conn()
+                response.release_conn()
+        except urllib3.exceptions.HTTPError as e:
             return SMSResult(
                 success=False,
-                error_message=f"Network error: {e.reason}"
+                error_message=f"Network error: {e}"
             )
         except Exception as e:
             return SMSResult(